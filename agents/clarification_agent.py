@@ -1,5 +1,7 @@
 """Ask the user for clarification when needed."""
 
+from collections import Counter
+from functools import lru_cache
 from pathlib import Path
 
 from agents.context import AgentContext
@@ -13,14 +15,19 @@ HISTORY_FILE = Path("logs") / "clarification_log.log"
 
 
 def _most_common_question() -> Optional[str]:
-    if not HISTORY_FILE.exists():
+    try:
+        stat = HISTORY_FILE.stat()
+    except OSError:
         return None
-    counts: dict[str, int] = {}
-    for line in HISTORY_FILE.read_text().splitlines():
-        q = line.split(" - ")[-1]
-        counts[q] = counts.get(q, 0) + 1
+    # Re-read the log only when it has changed since the last call
+    return _most_common_question_in(HISTORY_FILE, stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=8)
+def _most_common_question_in(path: Path, mtime_ns: int, size: int) -> Optional[str]:
+    counts = Counter(line.rpartition(" - ")[2] for line in path.read_text().splitlines())
     if counts:
-        return max(counts, key=lambda k: counts[k])
+        return counts.most_common(1)[0][0]
     return None
 
 
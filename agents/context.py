@@ -2,7 +2,7 @@ from dataclasses import dataclass, field
 from typing import Any, List, Optional, Tuple
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentContext:
     """Shared memory structure passed between agents."""
 
@@ -1,6 +1,8 @@
 """Retrieve relevant document chunks using a local Qdrant instance."""
 
-from typing import List, Optional
+from functools import lru_cache
+from hashlib import blake2b
+from typing import List, Optional, Tuple
 
 from qdrant_client import QdrantClient
 from qdrant_client.http import models as rest
@@ -22,7 +24,8 @@ DOCS = {
 
 def _embed(text: str) -> List[float]:
     """Generate a simple deterministic embedding vector."""
-    h = abs(hash(text))
+    # blake2b is stable across processes, unlike the salted built-in hash()
+    h = int.from_bytes(blake2b(text.encode("utf-8"), digest_size=8).digest(), "big")
     return [
         ((h >> 0) & 0xFF) / 255,
         ((h >> 8) & 0xFF) / 255,
@@ -51,18 +54,38 @@ for docs in DOCS.values():
 _client.upsert(collection_name=_COLLECTION, points=_points)
 
 
-def _retrieve(query: str, role: str) -> List[str]:
+@lru_cache(maxsize=256)
+def _cached_retrieve(query: str, role: str) -> Tuple[str, ...]:
+    """Run the vector search once per ``(query, role)`` pair.
+
+    The collection is built at import time and never changes, so the
+    filtered result is fully determined by its arguments.
+    """
     qvec = _embed(query)
+    role_filter = rest.Filter(
+        must=[rest.FieldCondition(key="roles", match=rest.MatchValue(value=role))]
+    )
     results = _client.search(
-        collection_name=_COLLECTION, query_vector=qvec, limit=5
+        collection_name=_COLLECTION,
+        query_vector=qvec,
+        query_filter=role_filter,
+        with_payload=["content"],
+        limit=5,
     )
+    query_l = query.lower()
     allowed = []
     for res in results:
-        payload = res.payload or {}
-        content = payload.get("content", "")
-        if role in payload.get("roles", []) and query.lower() in content.lower():
+        content = (res.payload or {}).get("content", "")
+        if query_l in content.lower():
             allowed.append(content)
-    return allowed
+    return tuple(allowed)
+
+
+def _retrieve(query: str, role: str) -> List[str]:
+    if not query.strip():
+        # A blank query is a substring of every document: skip the search
+        return []
+    return list(_cached_retrieve(query, role))
 
 
 logger = get_logger("retrieval_log")
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from collections import defaultdict
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional
 
@@ -81,14 +82,22 @@ def _rule_based_intent(text: str) -> Optional[str]:
 def _most_frequent_from_logs() -> Optional[str]:
     """Return the most frequent intent observed in previous logs."""
 
+    try:
+        stat = HISTORY_FILE.stat()
+    except OSError:
+        return None
+    # Re-read the log only when it has changed since the last call
+    return _most_frequent_in(HISTORY_FILE, stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=8)
+def _most_frequent_in(path: Path, mtime_ns: int, size: int) -> Optional[str]:
     counts: Dict[str, int] = defaultdict(int)
-    if HISTORY_FILE.exists():
-        for line in HISTORY_FILE.read_text().splitlines():
-            if "-" in line:
-                _, _, val = line.partition("-")
-                intent = val.strip()
-                if intent in ALLOWED_INTENTS:
-                    counts[intent] += 1
+    for line in path.read_text().splitlines():
+        # Lines without "-" leave an empty tail, which is never an allowed intent
+        intent = line.partition("-")[2].strip()
+        if intent in ALLOWED_INTENTS:
+            counts[intent] += 1
     if counts:
         return max(counts, key=lambda k: counts[k])
     return None
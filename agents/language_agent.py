@@ -17,8 +17,8 @@ def speech_to_text(audio_path: str) -> str:
 logger = get_logger("lang_log")
 
 
-def _detect_formality(text: str) -> str:
-    text_l = text.lower()
+def _detect_formality(text_l: str) -> str:
+    """Classify formality of already lower-cased text."""
     if any(w in text_l for w in FORMAL_WORDS):
         return "formal"
     if any(w in text_l for w in INFORMAL_WORDS):
@@ -35,9 +35,18 @@ LANGUAGE_KEYWORDS = {
 }
 
 
-def _mixed_language(text: str) -> bool:
-    tokens = set(re.findall(r"\b\w+\b", text.lower()))
-    detected = {lang for lang, words in LANGUAGE_KEYWORDS.items() if tokens & words}
+# Flattened keyword -> language index so each token is looked up once
+_WORD_TO_LANG = {
+    word: lang for lang, words in LANGUAGE_KEYWORDS.items() for word in words
+}
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def _mixed_language(text_l: str) -> bool:
+    """Check already lower-cased text for keywords of several languages."""
+    tokens = set(_TOKEN_RE.findall(text_l))
+    detected = {_WORD_TO_LANG[t] for t in tokens if t in _WORD_TO_LANG}
     return len(detected) > 1
 
 
@@ -49,8 +58,9 @@ def run(context: AgentContext) -> AgentContext:
 
     lang = detect_language(text)
     context.language = lang
-    context.formality = _detect_formality(text)
-    context.mixed_language = _mixed_language(text)
+    text_l = text.lower()
+    context.formality = _detect_formality(text_l)
+    context.mixed_language = _mixed_language(text_l)
     context.source_reliability = 0.7
     logger.info(
         f"{lang} {context.formality} mixed={context.mixed_language}",
@@ -10,8 +10,8 @@ from agents.translation_agent import run as translate
 from translator import translate as translate_text
 from agents.verification_agent import run as verify
 from models.call_local_llm import call_mistral
+from utils.json_utils import parse_json
 from utils.logger import get_logger
-import json
 
 
 logger = get_logger("orchestration_trace")
@@ -26,13 +26,16 @@ _STEP_MAP = {
 }
 
 
+# Predefined fallback plans as (reasoning, step names); shared across calls
+_QUOTE_FALLBACK = ("fallback: quote request", ("language", "intent", "retrieve", "respond"))
+_DEFAULT_FALLBACK = ("fallback: default", ("language", "intent", "respond"))
+
+
 def _fallback_sequence(context: AgentContext):
     if "quote" in context.input.lower():
-        seq = ["language", "intent", "retrieve", "respond"]
-        reasoning = "fallback: quote request"
+        reasoning, seq = _QUOTE_FALLBACK
     else:
-        seq = ["language", "intent", "respond"]
-        reasoning = "fallback: default"
+        reasoning, seq = _DEFAULT_FALLBACK
     return reasoning, [
         _STEP_MAP[name] for name in seq if name in _STEP_MAP
     ]
@@ -49,7 +52,7 @@ def choose_agent_sequence(context: AgentContext):
 
     try:
         raw = call_mistral(prompt)
-        data = json.loads(raw)
+        data = parse_json(raw) or {}
         context.reasoning_trace = data.get("reasoning", "")
         seq_names = data.get("sequence", [])
         seq = [_STEP_MAP.get(n) for n in seq_names if n in _STEP_MAP]
@@ -21,9 +21,10 @@ def run(context: AgentContext) -> AgentContext:
         context.source_reliability = 0.8
         mode = "action"
     else:
-        history_lines = [f"{role}:{msg}" for role, msg in context.conversation_history[-4:]]
-        history = " ".join(history_lines)
-        prompt_input = context.input + (" " + history if history else "")
+        history = " ".join(
+            f"{role}:{msg}" for role, msg in context.conversation_history[-4:]
+        )
+        prompt_input = f"{context.input} {history}" if history else context.input
         context.response = generate_response(
             prompt_input, context.intent or "", context.language
         )
@@ -1,5 +1,6 @@
 """Analyze logs to provide improvement suggestions."""
 
+import os
 from pathlib import Path
 
 from agents.context import AgentContext
@@ -28,13 +29,29 @@ def _analyze_validation_log(text: str) -> str | None:
     return None
 
 
+# Log analyzers keyed by log file stem
+_ANALYZERS = {
+    "intent_log": _analyze_intent_log,
+    "validation_log": _analyze_validation_log,
+}
+
+
+def _read_tail(path: Path, chars: int = 500) -> str:
+    """Return the last ``chars`` characters of ``path`` without reading it all."""
+    with path.open("rb") as f:
+        f.seek(0, os.SEEK_END)
+        # UTF-8 uses at most 4 bytes per character
+        f.seek(max(0, f.tell() - 4 * chars))
+        data = f.read()
+    return data.decode("utf-8", errors="ignore")[-chars:]
+
+
 def _collect_snippets() -> str:
     snippets = []
     for path in LOG_FILES:
         if not path.exists():
             continue
-        text = path.read_text()
-        snippets.append(f"## {path.name}\n{text[-500:]}")
+        snippets.append(f"## {path.name}\n{_read_tail(path)}")
     return "\n\n".join(snippets)
 
 
@@ -54,13 +71,10 @@ def run(context: AgentContext) -> AgentContext:
         for path in LOG_FILES:
             if not path.exists():
                 continue
-            text = path.read_text()
-            if "intent" in path.name:
-                result = _analyze_intent_log(text)
-            elif "validation" in path.name:
-                result = _analyze_validation_log(text)
-            else:
-                result = None
+            analyzer = _ANALYZERS.get(path.stem)
+            if analyzer is None:
+                continue
+            result = analyzer(path.read_text())
             if result:
                 suggestions.append(result)
         suggestion = "; ".join(suggestions) if suggestions else "No issues"
@@ -9,7 +9,8 @@ logger = get_logger("translation_log")
 
 
 def _auto_correct(text: str) -> str:
-    return text.replace(" teh ", " the ").replace("teh ", "the ")
+    # "teh " also covers " teh ", so one scan of the text is enough
+    return text.replace("teh ", "the ")
 
 
 def run(context: AgentContext, target_lang: str, style: str = "neutral") -> AgentContext:
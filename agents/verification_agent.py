@@ -1,5 +1,7 @@
 """Validate generated responses."""
 
+import concurrent.futures
+
 from agents.context import AgentContext
 from verifier import verify_response
 from utils.logger import get_logger
@@ -7,19 +9,26 @@ from utils.logger import get_logger
 
 logger = get_logger("validation_log")
 
+# (classification, result) indexed by the number of positive votes; the vote
+# loop stops at two, so the index never exceeds 2
+_OUTCOMES = (("invalid", False), ("uncertain", False), ("valid", True))
+
 
 def run(context: AgentContext) -> bool:
-    votes = [verify_response(context.input, context.response or "") for _ in range(3)]
-    positive = sum(votes)
-    if positive >= 2:
-        result = True
-        classification = "valid"
-    elif positive == 1:
-        result = False
-        classification = "uncertain"
-    else:
-        result = False
-        classification = "invalid"
+    answer = context.response or ""
+    # The three votes are independent LLM calls; overlap their round-trips
+    pool = concurrent.futures.ThreadPoolExecutor(max_workers=3)
+    futures = [pool.submit(verify_response, context.input, answer) for _ in range(3)]
+    positive = 0
+    try:
+        for future in concurrent.futures.as_completed(futures):
+            positive += future.result()
+            if positive >= 2:
+                # Majority reached: the remaining vote cannot change the outcome
+                break
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+    classification, result = _OUTCOMES[positive]
     context.error_flag = classification == "invalid"
     logger.info(
         classification,
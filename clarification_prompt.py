@@ -5,6 +5,10 @@ from config.intents_config import ALLOWED_INTENTS
 from language_detector import detect_language
 from agents.context import AgentContext
 
+# The intent taxonomy is fixed at import time: render it for prompts once
+_INTENT_LIST = ", ".join(sorted(ALLOWED_INTENTS))
+
+
 def generate_fallback_question(user_input: str) -> str:
     """
     Given a user input that failed intent classification, use Mistral to generate
@@ -17,14 +21,12 @@ def generate_fallback_question(user_input: str) -> str:
         str: A question that prompts the user to clarify their request.
     """
 
-    lang = detect_language(user_input)
-    intent_list = ", ".join(sorted(ALLOWED_INTENTS))
-
+    # Language handling is folded into this prompt: no separate detection call
     prompt = (
-        f"You are an AI assistant that replies in the same language as the user's message (detected language: {lang}).\n"
+        "You are an AI assistant that replies in the same language as the user's message.\n"
         "The user's message was ambiguous and the system could not determine the intent.\n"
         "Generate ONE short, precise, natural-sounding follow-up question to clarify what the user wants.\n"
-        f"The goal is to distinguish between intents such as: {intent_list}.\n"
+        f"The goal is to distinguish between intents such as: {_INTENT_LIST}.\n"
         "Your response must be ONLY the question, in the same language as the user.\n"
         f"\nUser message: \"{user_input}\"\n"
         "\nClarification question:"
@@ -34,7 +36,8 @@ def generate_fallback_question(user_input: str) -> str:
         return call_mistral(prompt).strip()
     except Exception:
         fallback_prompt = (
-            f"Translate the following sentence into {lang}: 'Could you clarify your request?'"
+            "Translate the sentence 'Could you clarify your request?' into the language "
+            f"of this message: \"{user_input}\". Return only the translated sentence."
         )
         return call_mistral(fallback_prompt).strip()
 
@@ -43,13 +46,11 @@ def generate_contextual_question(context: AgentContext) -> str:
     """Generate a clarification question using extra context."""
 
     lang = context.language or detect_language(context.input)
-    intent_list = ", ".join(sorted(ALLOWED_INTENTS))
     reasoning = context.reasoning_trace or ""
     prev_answer = context.response or ""
-    history_lines = []
-    for role, msg in context.conversation_history[-4:]:
-        history_lines.append(f"{role.capitalize()}: {msg}")
-    history = "\n".join(history_lines)
+    history = "\n".join(
+        f"{role.capitalize()}: {msg}" for role, msg in context.conversation_history[-4:]
+    )
 
     prompt = (
         f"You are an AI assistant that replies in the same language as the user's message (detected language: {lang}).\n"
@@ -58,7 +59,7 @@ def generate_contextual_question(context: AgentContext) -> str:
         f"Current system answer: {prev_answer}\n"
         + (f"Conversation so far:\n{history}\n" if history else "")
         + f"Generate ONE short, precise follow-up question to clarify the request.\n"
-        f"Possible intents include: {intent_list}.\n"
+        f"Possible intents include: {_INTENT_LIST}.\n"
         f"\nUser message: \"{context.input}\"\n"
         "\nClarification question:"
     )
@@ -1,3 +1,4 @@
+import concurrent.futures
 import json
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Protocol
@@ -34,13 +35,18 @@ class RecursiveCharacterTextSplitter:
                     continue
                 parts = current_text.split(separator)
                 temp_chunk: List[str] = []
+                # Lunghezza di separator.join(temp_chunk), aggiornata in modo incrementale
+                temp_len = 0
                 for part in parts:
-                    if len(separator.join(temp_chunk + [part])) <= self.chunk_size:
+                    candidate_len = temp_len + (len(separator) if temp_chunk else 0) + len(part)
+                    if candidate_len <= self.chunk_size:
                         temp_chunk.append(part)
+                        temp_len = candidate_len
                     else:
                         if temp_chunk:
                             new_queue.append(separator.join(temp_chunk))
                         temp_chunk = [part]
+                        temp_len = len(part)
                 if temp_chunk:
                     new_queue.append(separator.join(temp_chunk))
             queue = new_queue
@@ -95,7 +101,7 @@ class StructuredDataExtractor(ChunkingStrategy):
     def chunk(self, file_path: Path, source_id: str, metadata: Dict) -> List[Dict[str, Any]]:
         try:
             wb = load_workbook(file_path, data_only=True)
-            all_records: List[Dict[str, Any]] = []
+            raw_records: List[Dict[str, Any]] = []
 
             for sheet_name in wb.sheetnames:
                 if sheet_name.strip().upper() in {"INDEX", "COVER", "SOMMARIO", "SUMMARY"}:
@@ -121,8 +127,15 @@ class StructuredDataExtractor(ChunkingStrategy):
                         continue
 
                     # Estrai il numero massimo plausibile come prezzo
-                    numeric_vals = [float(v) for v in row_values if isinstance(v, (int, float)) and 1 <= v <= 10000]
-                    price = max(numeric_vals) if numeric_vals else None
+                    price = max(
+                        (
+                            float(v)
+                            for v in row_values
+                            if isinstance(v, (int, float))
+                            and PipelineConfig.MIN_PLAUSIBLE_PRICE <= v <= PipelineConfig.MAX_PLAUSIBLE_PRICE
+                        ),
+                        default=None,
+                    )
 
                     # Estrai descrizione testuale coerente
                     for val in row_values:
@@ -139,8 +152,11 @@ class StructuredDataExtractor(ChunkingStrategy):
                             "discontinued" if "discontinued" in sheet_name.lower() else "active"
                         )
                     }
-                    validated_record = validate_record_with_llm(record)
-                    all_records.append(validated_record)
+                    raw_records.append(record)
+
+            # Le validazioni LLM sono indipendenti tra loro: le esegue in parallelo
+            with concurrent.futures.ThreadPoolExecutor() as pool:
+                all_records = list(pool.map(validate_record_with_llm, raw_records))
 
             # Conversione in chunk semantico RAG-ready
             def render_as_text(rec: Dict[str, Any]) -> str:
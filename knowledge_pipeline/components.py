@@ -1,7 +1,7 @@
 import zipfile
 from pathlib import Path
 from tempfile import TemporaryDirectory
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 import re
 
 import docx
@@ -11,6 +11,7 @@ import spacy
 from functools import lru_cache
 from spacy.cli.download import download
 
+from .config import PipelineConfig
 from .logging_config import setup_logging
 
 logger = setup_logging()
@@ -25,7 +26,7 @@ class FileScanner:
 
     def scan(self, path: Path) -> List[Path]:
         logger.info(f"Avvio scansione in: {path}")
-        files_to_process: List[Path] = []
+        files_to_process: Iterable[Path] = []
         if path.is_file():
             if path.suffix.lower() == ".zip":
                 self._temp_dir = TemporaryDirectory()
@@ -33,7 +34,7 @@ class FileScanner:
                 logger.info(f"Estrazione file ZIP in directory temporanea: {zip_base_path}")
                 with zipfile.ZipFile(path, "r") as zf:
                     zf.extractall(zip_base_path)
-                files_to_process = list(zip_base_path.rglob("*"))
+                files_to_process = zip_base_path.rglob("*")
             elif path.suffix.lower() in self.supported_extensions:
                 files_to_process = [path]
             else:
@@ -42,12 +43,18 @@ class FileScanner:
                 )
                 return []
         elif path.is_dir():
-            files_to_process = list(path.rglob("*"))
+            files_to_process = path.rglob("*")
         else:
             logger.error(f"Il percorso di input '{path}' non è valido")
             return []
 
-        supported_files = [f for f in files_to_process if f.is_file() and f.suffix.lower() in self.supported_extensions]
+        # Un solo passaggio sul walk; il controllo sul suffisso evita la stat() sui file scartati.
+        # I link simbolici allo stesso file vengono elaborati una sola volta, nell'ordine del walk
+        unique_files: Dict[Path, Path] = {}
+        for f in files_to_process:
+            if f.suffix.lower() in self.supported_extensions and f.is_file():
+                unique_files.setdefault(f.resolve(), f)
+        supported_files = list(unique_files.values())
         logger.info(f"Trovati {len(supported_files)} file supportati.")
         return supported_files
 
@@ -62,57 +69,84 @@ class TextExtractor:
 
     def extract(self, path: Path, min_size: int, preview_rows: int) -> str:
         logger.info(f"Estrazione testo da: {path.name}")
-        text = ""
         try:
-            ext = path.suffix.lower()
-            if ext == ".pdf":
-                with pdfplumber.open(path) as pdf:
-                    all_text = [page.extract_text() for page in pdf.pages if page.extract_text()]
-                text = "\n".join(all_text)
-            elif ext == ".docx":
-                doc = docx.Document(str(path))
-                all_text = [para.text for para in doc.paragraphs if para.text.strip()]
-                text = "\n".join(all_text)
-            elif ext == ".xlsx":
-                with pd.ExcelFile(path) as xls:
-                    all_sheet_previews = []
-                    for sheet_name in xls.sheet_names:
-                        try:
-                            df = pd.read_excel(xls, sheet_name=sheet_name, nrows=preview_rows)
-                            all_sheet_previews.append(
-                                f"--- Foglio: {sheet_name} ---\n{df.to_string(index=False)}"
-                            )
-                        except Exception as e:  # pragma: no cover - log and continue
-                            logger.warning(f"Impossibile parsare il foglio '{sheet_name}' da '{path.name}': {e}")
-                    text = "\n\n".join(all_sheet_previews)
-            elif ext == ".csv":
-                df = pd.read_csv(path, nrows=preview_rows)
-                text = df.to_string(index=False)
-            elif ext in [".json", ".xml", ".txt", ".html", ".htm"]:
-                text = path.read_text(encoding="utf-8", errors="ignore")
+            extractor = self._EXTRACTORS.get(path.suffix.lower())
+            text = extractor(path, preview_rows) if extractor else ""
             return "" if len(text.strip()) < min_size else text
         except Exception:  # pragma: no cover - log errors
             logger.error(f"Errore durante l'estrazione del testo da '{path.name}'.", exc_info=True)
             return ""
 
+    @staticmethod
+    def _extract_pdf(path: Path, preview_rows: int) -> str:
+        with pdfplumber.open(path) as pdf:
+            all_text = [page.extract_text() for page in pdf.pages if page.extract_text()]
+        return "\n".join(all_text)
+
+    @staticmethod
+    def _extract_docx(path: Path, preview_rows: int) -> str:
+        doc = docx.Document(str(path))
+        all_text = [para.text for para in doc.paragraphs if para.text.strip()]
+        return "\n".join(all_text)
+
+    @staticmethod
+    def _extract_xlsx(path: Path, preview_rows: int) -> str:
+        with pd.ExcelFile(path) as xls:
+            all_sheet_previews = []
+            for sheet_name in xls.sheet_names:
+                try:
+                    df = pd.read_excel(xls, sheet_name=sheet_name, nrows=preview_rows)
+                    all_sheet_previews.append(
+                        f"--- Foglio: {sheet_name} ---\n{df.to_string(index=False)}"
+                    )
+                except Exception as e:  # pragma: no cover - log and continue
+                    logger.warning(f"Impossibile parsare il foglio '{sheet_name}' da '{path.name}': {e}")
+            return "\n\n".join(all_sheet_previews)
+
+    @staticmethod
+    def _extract_csv(path: Path, preview_rows: int) -> str:
+        df = pd.read_csv(path, nrows=preview_rows)
+        return df.to_string(index=False)
+
+    @staticmethod
+    def _extract_plain(path: Path, preview_rows: int) -> str:
+        return path.read_text(encoding="utf-8", errors="ignore")
+
+    # Estensione -> estrattore: una sola lookup invece della catena di if/elif
+    _EXTRACTORS = {
+        ".pdf": _extract_pdf,
+        ".docx": _extract_docx,
+        ".xlsx": _extract_xlsx,
+        ".csv": _extract_csv,
+        ".json": _extract_plain,
+        ".xml": _extract_plain,
+        ".txt": _extract_plain,
+        ".html": _extract_plain,
+        ".htm": _extract_plain,
+    }
+
+
+@lru_cache(maxsize=1)
+def _get_nlp():
+    """Carica il modello SpaCy una sola volta per processo, condiviso da tutti gli estrattori."""
+    # GPU solo se abilitata in configurazione (richiede cupy)
+    if PipelineConfig.SPACY_USE_GPU and spacy.prefer_gpu():
+        logger.info("GPU disponibile: SpaCy userà la GPU per l'estrazione delle entità.")
+    logger.info("Caricamento del modello SpaCy 'xx_ent_wiki_sm'...")
+    try:
+        return spacy.load("xx_ent_wiki_sm")
+    except OSError:  # pragma: no cover - attempt download
+        logger.warning("Modello SpaCy 'xx_ent_wiki_sm' non trovato. Scarico...")
+        download("xx_ent_wiki_sm")
+        return spacy.load("xx_ent_wiki_sm")
+
 
 class EntityExtractor:
     """Estrae entità nominate dal testo usando SpaCy e filtra i termini generici."""
 
-    @lru_cache(maxsize=1)
-    def _get_nlp(self):
-        logger.info("Caricamento del modello SpaCy 'xx_ent_wiki_sm'...")
-        try:
-            return spacy.load("xx_ent_wiki_sm")
-        except OSError:  # pragma: no cover - attempt download
-            logger.warning("Modello SpaCy 'xx_ent_wiki_sm' non trovato. Scarico...")
-            download("xx_ent_wiki_sm")
-            return spacy.load("xx_ent_wiki_sm")
-
-    def extract(self, text: str) -> List[str]:
-        nlp = self._get_nlp()
-        doc = nlp(text)
-        noisy_terms = {
+    # Termini generici da scartare e label SpaCy accettate, allocati una sola volta
+    NOISY_TERMS = frozenset(
+        {
             "nan",
             "price",
             "description",
@@ -153,17 +187,24 @@ class EntityExtractor:
             "from",
             "until",
             "for",
-            "with",
             "a",
             "an",
             "the",
             "and",
         }
+    )
+    ENTITY_LABELS = frozenset({"ORG", "PRODUCT", "WORK_OF_ART", "MISC"})
+    # Entità composte solo da cifre e spazi
+    NUMERIC_ENTITY_RE = re.compile(r"(\d+|\n|\s)+")
+
+    def extract(self, text: str) -> List[str]:
+        nlp = _get_nlp()
+        doc = nlp(text)
         entities = set()
         for ent in doc.ents:
             entity_text = ent.text.strip()
-            if ent.label_ in {"ORG", "PRODUCT", "WORK_OF_ART", "MISC"} and len(entity_text) > 2 and entity_text.lower() not in noisy_terms:
-                if not re.fullmatch(r"(\d+|\n|\s)+", entity_text):
+            if ent.label_ in self.ENTITY_LABELS and len(entity_text) > 2 and entity_text.lower() not in self.NOISY_TERMS:
+                if not self.NUMERIC_ENTITY_RE.fullmatch(entity_text):
                     entities.add(entity_text)
         logger.info(f"Estratti {len(entities)} entità uniche e filtrate.")
         return sorted(list(entities))
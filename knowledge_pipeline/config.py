@@ -18,9 +18,17 @@ class PipelineConfig:
     CHUNK_SIZE = 1024
     CHUNK_OVERLAP = 128
 
+    # SpaCy su GPU per l'estrazione delle entità. Disattivato di default: ogni processo
+    # worker aprirebbe un proprio contesto CUDA sulla GPU che serve a Ollama
+    SPACY_USE_GPU = False
+
     # Soglie di affidabilità
     LLM_CLASSIFICATION_THRESHOLD = 0.80
     CROSS_CHECK_CONFIDENCE_THRESHOLD = 0.95
 
+    # Intervallo dei prezzi plausibili nei listini Excel
+    MIN_PLAUSIBLE_PRICE = 1
+    MAX_PLAUSIBLE_PRICE = 10000
+
     QUARANTINE_DIR = "quarantine"
     PRODUCT_STATUS_FIELD_NAME = "product_status"
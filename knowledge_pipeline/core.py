@@ -4,7 +4,7 @@ import hashlib
 import json
 import shutil
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Any, Callable, Dict, Iterator, List, Optional
 
 import pandas as pd
 
@@ -18,10 +18,42 @@ from .llm_utils import (
     fallback_llm_client,
     primary_llm_client,
 )
+from utils.json_utils import dumps as json_dumps
 
 logger = setup_logging()
 
 
+# Prefissi delle parti del riassunto di un record, nell'ordine di (descrizione, seriale, prezzo, foglio)
+_SUMMARY_LABELS = ("", "Seriale: ", "Prezzo: ", "Foglio: ")
+
+
+def _safe_get(obj: Dict[str, Any], key: str, formatter: Optional[Callable[[Any], Any]] = None) -> Any:
+    """Legge e formatta un valore, restituendo ``None`` se assente o vuoto."""
+    value = obj.get(key)
+    if value is None or value == "":
+        return None
+    return formatter(value) if formatter else value
+
+
+def _format_price(price: Any) -> Optional[str]:
+    """Formatta il prezzo validandolo."""
+    try:
+        return f"{float(price):.2f}€"
+    except (ValueError, TypeError):
+        logger.warning(f"Prezzo non valido: {price}")
+        return None
+
+
+def _product_questions(identifier: str) -> List[str]:
+    """Domande standard relative a un prodotto."""
+    return [
+        f"Qual è il prezzo di {identifier}?",
+        f"Qual è il seriale di {identifier}?",
+        f"È {identifier} discontinuato?",
+        f"Ci sono alternative per {identifier}?",
+    ]
+
+
 class KnowledgePipeline:
     """Orchestra il processo di ingestione con focus su affidabilità e parallelismo."""
 
@@ -46,17 +78,21 @@ class KnowledgePipeline:
     def _quarantine_file(self, file_path: Path, reason: str) -> None:
         try:
             self.quarantine_path.mkdir(parents=True, exist_ok=True)
-            quarantine_target = self.quarantine_path / f"{pd.Timestamp.utcnow().strftime('%Y%m%d%H%M%S')}_{file_path.name}"
+            # Un solo timestamp per nome file e log: restano coerenti tra loro
+            quarantined_at = pd.Timestamp.utcnow()
+            quarantine_target = self.quarantine_path / f"{quarantined_at.strftime('%Y%m%d%H%M%S')}_{file_path.name}"
             logger.warning(f"Metto in quarantena il file '{file_path.name}'. Motivo: {reason}")
             shutil.copy(str(file_path), str(quarantine_target))
             with open(self.quarantine_path / f"{quarantine_target.name}.reason.log", "w", encoding="utf-8") as f:
                 f.write(
-                    f"File in quarantena a {pd.Timestamp.utcnow().isoformat()}\nMotivo: {reason}\nPercorso originale: {file_path}\n"
+                    f"File in quarantena a {quarantined_at.isoformat()}\nMotivo: {reason}\nPercorso originale: {file_path}\n"
                 )   
             try:
-                snapshot_text = file_path.read_text(encoding="utf-8", errors="ignore")
+                # Legge solo i caratteri che finiscono nello snapshot, non l'intero file
+                with open(file_path, "r", encoding="utf-8", errors="ignore") as src:
+                    snapshot_text = src.read(100000)
                 with open(self.quarantine_path / f"{quarantine_target.name}.txt", "w", encoding="utf-8") as snap:
-                    snap.write(snapshot_text[:100000])
+                    snap.write(snapshot_text)
             except Exception as e:  # pragma: no cover - log warning
                 logger.warning(f"Impossibile salvare snapshot per {file_path.name}: {e}")
         except Exception:  # pragma: no cover - log critical
@@ -167,42 +203,21 @@ class KnowledgePipeline:
                 pass
 
             if is_json_content:
-                # Helper functions for safe value handling
-                def safe_get(obj, key, formatter=None):
-                    """Safely get and format a value from the object."""
-                    value = obj.get(key)
-                    if value is None or value == "":
-                        return None
-                    return formatter(value) if formatter else value
-
-                def format_price(price):
-                    """Format price with validation."""
-                    try:
-                        return f"{float(price):.2f}€"
-                    except (ValueError, TypeError):
-                        logger.warning(f"Prezzo non valido: {price}")
-                        return None
+                # Ogni campo viene letto una sola volta e riusato per riassunto e domande
+                desc = _safe_get(content_obj, "description")
+                serial = _safe_get(content_obj, "serial")
+                price = _safe_get(content_obj, "price", _format_price)
+                sheet = _safe_get(content_obj, "sheet_name")
+                discontinued = content_obj.get(PipelineConfig.PRODUCT_STATUS_FIELD_NAME) == "discontinued"
+                product_ref = desc or serial or "questo prodotto"
 
                 # Build summary parts
-                summary_parts = []
-                
-                # Add description if available
-                if desc := safe_get(content_obj, "description"):
-                    summary_parts.append(desc)
-
-                # Add serial if available
-                if serial := safe_get(content_obj, "serial"):
-                    summary_parts.append(f"Seriale: {serial}")
-
-                # Add price if available and valid
-                if price := safe_get(content_obj, "price", format_price):
-                    summary_parts.append(f"Prezzo: {price}")
-
-                # Add sheet name if available
-                if sheet := safe_get(content_obj, "sheet_name"):
-                    summary_parts.append(f"Foglio: {sheet}")
-                # Add status if discontinued
-                if content_obj and content_obj.get(PipelineConfig.PRODUCT_STATUS_FIELD_NAME) == "discontinued":
+                summary_parts = [
+                    f"{label}{value}"
+                    for label, value in zip(_SUMMARY_LABELS, (desc, serial, price, sheet))
+                    if value
+                ]
+                if discontinued:
                     summary_parts.append("Stato: Discontinuato")
 
                 # Set summary
@@ -212,47 +227,20 @@ class KnowledgePipeline:
 
                 # Generate hypothetical questions
                 hypothetical_questions = []
-
-                def add_product_questions(identifier):
-                    """Add standard product-related questions."""
-                    if identifier:
-                        hypothetical_questions.extend([
-                            f"Qual è il prezzo di {identifier}?",
-                            f"Qual è il seriale di {identifier}?",
-                            f"È {identifier} discontinuato?",
-                            f"Ci sono alternative per {identifier}?"
-                        ])
-
-                # Add questions based on available data
-                if desc := safe_get(content_obj, "description"):
-                    add_product_questions(desc)
-                elif serial := safe_get(content_obj, "serial"):
-                    add_product_questions(serial)
+                if desc:
+                    hypothetical_questions.extend(_product_questions(desc))
+                elif serial:
+                    hypothetical_questions.extend(_product_questions(serial))
                     hypothetical_questions.extend([
                         f"Qual è la descrizione del prodotto con seriale {serial}?",
                         f"Quanto costa il prodotto {serial}?"
                     ])
-
-                # Add sheet-specific question
-                if sheet := safe_get(content_obj, "sheet_name"):
-                    product_ref = (
-                        safe_get(content_obj, "description") or 
-                        safe_get(content_obj, "serial") or 
-                        "questo prodotto"
-                    )
+                if sheet:
                     hypothetical_questions.append(
                         f"A quale foglio appartiene {product_ref}?"
                     )
-                # Add status-specific questions
-                if content_obj and content_obj.get(PipelineConfig.PRODUCT_STATUS_FIELD_NAME) == "discontinued":
-                    product_ref = (
-                        safe_get(content_obj, "description") or 
-                        safe_get(content_obj, "serial") or 
-                        "questo prodotto"
-                    )
-                    hypothetical_questions.extend([
-                        f"Ci sono alternative per {product_ref}?"
-                    ])
+                if discontinued:
+                    hypothetical_questions.append(f"Ci sono alternative per {product_ref}?")
 
                 # Add fallback question if no specific questions were generated
                 if not hypothetical_questions:
@@ -283,25 +271,32 @@ class KnowledgePipeline:
         logger.info(f"Creati e arricchiti con successo {len(enriched_chunks)} chunk per '{path.name}'.")
         return enriched_chunks
 
-    def run(self, input_path: Path) -> List[Dict[str, Any]]:
-        all_chunks: List[Dict[str, Any]] = []
+    def iter_chunks(self, input_path: Path) -> Iterator[Dict[str, Any]]:
+        """Restituisce i chunk file per file, appena ciascun file è stato elaborato."""
+        total = 0
         files = self.scanner.scan(input_path)
-        with concurrent.futures.ProcessPoolExecutor() as executor:
-            future_to_file = {executor.submit(self.process_file, file): file for file in files}
-            for future in concurrent.futures.as_completed(future_to_file):
-                file = future_to_file[future]
-                try:
-                    result_chunks = future.result()
+        try:
+            with concurrent.futures.ProcessPoolExecutor() as executor:
+                future_to_file = {executor.submit(self.process_file, file): file for file in files}
+                for future in concurrent.futures.as_completed(future_to_file):
+                    file = future_to_file[future]
+                    try:
+                        result_chunks = future.result()
+                    except Exception as e:  # pragma: no cover - log critical
+                        logger.critical(
+                            f"Errore critico durante l'elaborazione di '{file.name}': {e}", exc_info=True
+                        )
+                        self._quarantine_file(file, f"Errore critico della pipeline: {e}")
+                        continue
                     if result_chunks:
-                        all_chunks.extend(result_chunks)
-                except Exception as e:  # pragma: no cover - log critical
-                    logger.critical(
-                        f"Errore critico durante l'elaborazione di '{file.name}': {e}", exc_info=True
-                    )
-                    self._quarantine_file(file, f"Errore critico della pipeline: {e}")
-        self.scanner.cleanup()
-        logger.info(f"Pipeline completata. Totale chunk generati: {len(all_chunks)}")
-        return all_chunks
+                        total += len(result_chunks)
+                        yield from result_chunks
+        finally:
+            self.scanner.cleanup()
+        logger.info(f"Pipeline completata. Totale chunk generati: {total}")
+
+    def run(self, input_path: Path) -> List[Dict[str, Any]]:
+        return list(self.iter_chunks(input_path))
 
 
 def cli() -> None:
@@ -314,13 +309,15 @@ def cli() -> None:
 
     config = PipelineConfig()
     pipeline = KnowledgePipeline(config)
-    processed_chunks = pipeline.run(Path(args.input_path))
 
     output_path = Path(args.output)
     output_path.parent.mkdir(parents=True, exist_ok=True)
     with open(output_path, "w", encoding="utf-8") as f:
-        for chunk in processed_chunks:
-            f.write(json.dumps(chunk, ensure_ascii=False, indent=None) + "\n")
+        # Scrive i chunk man mano che i file vengono completati: in memoria resta un file alla volta
+        f.writelines(
+            json_dumps(chunk) + "\n"
+            for chunk in pipeline.iter_chunks(Path(args.input_path))
+        )
     logger.info(f"Risultati salvati in: {output_path}")
     logger.info(
         f"I file che richiedono revisione manuale sono stati spostati nella directory '{config.QUARANTINE_DIR}'."
@@ -1,13 +1,17 @@
 import json
+import math
+import random
 import re
 import subprocess
 import time
 from functools import wraps
-from typing import Any, Callable, Dict, List
+from typing import Any, Callable, Dict, List, Optional
 
 from models._call_llm import LLMClient, ModelName
+from .config import PipelineConfig
 from .logging_config import setup_logging
 from prompts import LLMPrompts
+from utils.json_utils import loads as json_loads, parse_json
 
 logger = setup_logging()
 
@@ -15,9 +19,21 @@ logger = setup_logging()
 primary_llm_client = LLMClient(default_model="deepseek-r1:14b")
 fallback_llm_client = LLMClient(default_model="mistral")
 
+# Blocco ```json ... ``` richiesto dai prompt; il primo match è quello che viene parsato
+_JSON_FENCE_RE = re.compile(r"```json\s*([\s\S]+?)\s*```")
+# Testo "Reasoning: ..." che precede il blocco JSON nella risposta di classificazione
+_REASONING_RE = re.compile(r"Reasoning:\s*(.*?)(?=\n```json|$)", re.IGNORECASE | re.DOTALL)
+
+# Campi del record che il LLM può correggere in validate_record_with_llm;
+# il seriale è la chiave del prodotto e resta sempre quello del foglio
+_VALIDATED_RECORD_FIELDS = ("description", "price")
+
 
 def resilient_llm_call(retries: int = 3, delay: int = 5) -> Callable:
-    """Decoratore per aggiungere logica di retry alle chiamate LLM."""
+    """Decoratore per aggiungere logica di retry alle chiamate LLM.
+
+    L'attesa tra i tentativi parte da ``delay`` secondi e raddoppia a ogni retry.
+    """
 
     def decorator(func: Callable) -> Callable:
         @wraps(func)
@@ -32,7 +48,7 @@ def resilient_llm_call(retries: int = 3, delay: int = 5) -> Callable:
                     ):
                         return result
                     logger.warning(
-                        f"Tentativo {attempt}/{retries}: Chiamata LLM vuota. Riprovo tra {delay}s per {func.__name__}..."
+                        f"Tentativo {attempt}/{retries}: Chiamata LLM vuota per {func.__name__}."
                     )
                 except subprocess.CalledProcessError as e:
                     logger.error(
@@ -43,7 +59,13 @@ def resilient_llm_call(retries: int = 3, delay: int = 5) -> Callable:
                         f"Tentativo {attempt}/{retries}: eccezione imprevista per {func.__name__}.",
                         exc_info=True,
                     )
-                time.sleep(delay)
+                if attempt < retries:
+                    # Nessuna attesa dopo l'ultimo tentativo: non ci sono altri retry.
+                    # Backoff esponenziale con jitter, così i worker paralleli non
+                    # ritentano tutti nello stesso istante sul server Ollama.
+                    wait = delay * 2 ** (attempt - 1) + random.uniform(0, delay)
+                    logger.info(f"Riprovo {func.__name__} tra {wait:.1f}s...")
+                    time.sleep(wait)
             logger.critical(
                 f"Tutti i {retries} tentativi falliti per {func.__name__}. Restituisco valore vuoto di default."
             )
@@ -58,26 +80,25 @@ def resilient_llm_call(retries: int = 3, delay: int = 5) -> Callable:
     return decorator
 
 
-def _parse_llm_json_output(raw_output: str) -> Any:
-    """Parsa in modo sicuro il JSON da un output LLM raw."""
+def _parse_llm_json_output(raw_output: str) -> Dict[str, Any]:
+    """Parsa in modo sicuro l'oggetto JSON da un output LLM raw; ``{}`` se assente."""
     if raw_output is None or not isinstance(raw_output, str) or not raw_output.strip():
         logger.warning("Input to _parse_llm_json_output was None or empty")
         return {}
-    try:
-        match = re.search(r"```json\s*([\s\S]+?)\s*```", raw_output)
-        if match:
-            return json.loads(match.group(1))
-        raw_output = raw_output.strip()
-        if (raw_output.startswith("{") and raw_output.endswith("}")) or (
-            raw_output.startswith("[") and raw_output.endswith("]")
-        ):
-            return json.loads(raw_output)
-        return {}
-    except json.JSONDecodeError as e:
-        logger.warning(
-            f"Impossibile decodificare JSON dall'output LLM: '{raw_output[:100]}...'. Errore: {e}"
-        )
-        return {}
+    match = _JSON_FENCE_RE.search(raw_output)
+    if match:
+        try:
+            parsed = json_loads(match.group(1))
+            if isinstance(parsed, dict):
+                return parsed
+        except json.JSONDecodeError as e:
+            logger.warning(
+                f"Impossibile decodificare JSON dall'output LLM: '{raw_output[:100]}...'. Errore: {e}"
+            )
+    # Nessun blocco ```json valido: cerca il primo oggetto decodificabile nel testo,
+    # saltando parentesi della prosa (es. "[0, 1]" nel ragionamento <think>)
+    parsed = parse_json(raw_output)
+    return parsed if parsed is not None else {}
 
 
 @resilient_llm_call()
@@ -97,8 +118,18 @@ def call_llm_for_classification(
             f"Risposta in streaming da Deepseek per '{filename}' - output live qui sotto:"
         )
         print(f"\n--- Stream di Risposta LLM per {filename} ({model}) ---\n")
-        for chunk_text in client.stream(prompt, model=model, print_live=True):
-            full_response_content += chunk_text
+        chunks: List[str] = []
+        stream = client.stream(prompt, model=model, print_live=True)
+        try:
+            for chunk_text in stream:
+                chunks.append(chunk_text)
+                # Interrompe lo stream appena il blocco JSON è chiuso: il resto verrebbe scartato
+                if "`" in chunk_text and _JSON_FENCE_RE.search("".join(chunks)):
+                    break
+        finally:
+            # Chiude lo stream anche in caso di errore, senza attendere il garbage collector
+            stream.close()
+        full_response_content = "".join(chunks)
         print("\n--- Fine Stream di Risposta LLM ---\n")
     else:
         raw_response = client.call(prompt, model=model)
@@ -108,7 +139,7 @@ def call_llm_for_classification(
     parsed = _parse_llm_json_output(full_response_content)
     reasoning = parsed.get("reasoning")
     if not reasoning:
-        match = re.search(r"Reasoning:\s*(.*?)(?=\n```json|$)", full_response_content, re.IGNORECASE | re.DOTALL)
+        match = _REASONING_RE.search(full_response_content)
         if match:
             reasoning = match.group(1).strip()
         else:
@@ -122,6 +153,31 @@ def call_llm_for_classification(
     return parsed
 
 
+def _plausible_price(value: Any) -> Optional[float]:
+    """Prezzo come float se numerico, finito e nell'intervallo dell'estrattore, altrimenti ``None``."""
+    if isinstance(value, bool):
+        return None
+    try:
+        price = float(value)
+    except (TypeError, ValueError):
+        return None
+    if not math.isfinite(price):
+        return None
+    if not PipelineConfig.MIN_PLAUSIBLE_PRICE <= price <= PipelineConfig.MAX_PLAUSIBLE_PRICE:
+        return None
+    return price
+
+
+def _validated_value(key: str, value: Any, original: Any) -> Any:
+    """Valore corretto dal LLM per ``key``; quello del foglio se vuoto o non valido."""
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return original
+    if key == "price":
+        price = _plausible_price(value)
+        return original if price is None else price
+    return value
+
+
 @resilient_llm_call()
 def validate_record_with_llm(record: Dict[str, Any], client: LLMClient = primary_llm_client) -> Dict[str, Any]:
     """
@@ -135,17 +191,19 @@ def validate_record_with_llm(record: Dict[str, Any], client: LLMClient = primary
             model="deepseek-r1:14b"
         )
 
-        if not isinstance(response, dict):
+        parsed = _parse_llm_json_output(response)
+        if not isinstance(parsed, dict) or not parsed:
             logger.warning(f"Risposta LLM non valida: {response}")
             return record
 
-        return {
-            "serial": response.get("serial", record.get("serial")),
-            "description": response.get("description", record.get("description")),
-            "price": response.get("price", record.get("price")),
-            "sheet_name": record.get("sheet_name"),
-            "product_status": record.get("product_status"),
+        validated = {
+            key: _validated_value(key, parsed.get(key), record.get(key))
+            for key in _VALIDATED_RECORD_FIELDS
         }
+        validated["serial"] = record.get("serial")
+        validated["sheet_name"] = record.get("sheet_name")
+        validated["product_status"] = record.get("product_status")
+        return validated
 
     except Exception as e:
         logger.error("Errore nella validazione record con LLM", exc_info=True)
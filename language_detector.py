@@ -1,14 +1,89 @@
+import threading
+from functools import lru_cache
+
 from models.call_local_llm import call_mistral
 
+try:  # optional dependency for local language identification
+    from lingua import LanguageDetectorBuilder
+except ImportError:  # pragma: no cover - fall back to the LLM only
+    LanguageDetectorBuilder = None
+
+# lingua's answer is used only at or above this confidence; below it (short or
+# mixed inputs) Mistral decides
+MIN_LOCAL_CONFIDENCE = 0.8
+
+
+# Serializes the first build: lru_cache does not stop concurrent callers
+# (the startup warm-up and the first message) from each building a detector
+_detector_lock = threading.Lock()
+
+
+def _get_detector():
+    """Return the shared lingua detector; ``None`` if lingua is not installed."""
+    with _detector_lock:
+        return _build_detector()
+
+
+@lru_cache(maxsize=1)
+def _build_detector():
+    if LanguageDetectorBuilder is None:
+        return None
+    # All languages, so an unexpected one (e.g. Portuguese) is recognised
+    # instead of being forced onto its nearest neighbour. Low accuracy mode
+    # keeps that cheap (~70 MB, under a second; the full models need ~900 MB);
+    # its weaker guesses on short texts fall below MIN_LOCAL_CONFIDENCE.
+    # Models are loaded here rather than lazily on the first detection.
+    return (
+        LanguageDetectorBuilder.from_all_languages()
+        .with_low_accuracy_mode()
+        .with_preloaded_language_models()
+        .build()
+    )
+
+
+def warm_up() -> None:
+    """Build the detector and load its language models ahead of the first message."""
+    _get_detector()
+
+
+def _detect_locally(user_input: str) -> str | None:
+    detector = _get_detector()
+    if detector is None:
+        return None
+    values = detector.compute_language_confidence_values(user_input)
+    if not values or values[0].value < MIN_LOCAL_CONFIDENCE:
+        return None
+    return values[0].language.iso_code_639_1.name.lower()
+
+
 def detect_language(user_input: str) -> str:
     """
-    Detect the language of the user input using Mistral.
+    Detect the language of the user input.
+
+    The local lingua detector is tried first; Mistral is only called when
+    lingua is unavailable or not confident enough, and its answers are
+    memoized per message.
 
     Returns:
         A two-letter ISO language code (e.g., 'en', 'it', 'fr').
         Defaults to 'en' if detection fails or is unclear.
     """
 
+    try:
+        lang = _detect_locally(user_input)
+        if lang:
+            return lang
+    except Exception:
+        pass
+
+    try:
+        return _detect_with_llm(user_input)
+    except Exception:
+        return "en"
+
+
+@lru_cache(maxsize=1024)
+def _detect_with_llm(user_input: str) -> str:
     prompt = (
         "Detect the language of the following user message.\n"
         "Reply ONLY with the ISO 639-1 language code (like 'en', 'it', 'fr', 'de').\n"
@@ -16,11 +91,10 @@ def detect_language(user_input: str) -> str:
         f"Message: \"{user_input}\"\n"
         "Language code:"
     )
-
-    try:
-        lang = call_mistral(prompt).strip().lower()
-        if len(lang) == 2 and lang.isalpha():
-            return lang
-        return "en"
-    except Exception:
-        return "en"
+    lang = call_mistral(prompt).strip().lower()
+    if not lang:
+        # Model unavailable: raise so the failure is not memoized
+        raise RuntimeError("empty language detection")
+    if len(lang) == 2 and lang.isalpha():
+        return lang
+    return "en"
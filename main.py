@@ -1,5 +1,8 @@
+import threading
+
 from agents.context import AgentContext
 from agents.orchestrator_agent import run as orchestrate
+from language_detector import warm_up as warm_up_language_detector
 
 # ANSI terminal color codes
 RED = "\x1b[31m"
@@ -8,6 +11,8 @@ RESET = "\x1b[0m"
 
 def main():
     print("💬 Kchat\n")
+    # Load the language models while the user types the first message
+    threading.Thread(target=warm_up_language_detector, daemon=True).start()
 
     context = AgentContext(session_id='qwerty', user_id="power_user", input="")
 
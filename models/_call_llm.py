@@ -15,8 +15,9 @@ except ImportError:  # Provide a minimal stub so other modules can run
     ollama = _OllamaStub()
 import logging
 import json
+from functools import lru_cache
 from typing import Iterator, Literal, Dict, Any, Optional, List
-from agents.context import AgentContext
+from utils.json_utils import loads as json_loads
 # --- Configurazione e Tipi ---
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -30,8 +31,6 @@ ModelName = Literal[
     "llama3:8b-instruct"
 ]
 
-#TODO verificare se viene tenuto contento del context.conversation_history 
-
 # --- Classe Client per Ollama ---
 #1.  [User Input] 
 #2.  [ContextManager] = aggiorna history, estrae contesto (lingua, topic, entità)
@@ -51,6 +50,17 @@ ModelName = Literal[
 
 
 
+@lru_cache(maxsize=1)
+def _ensure_ollama_connection() -> None:
+    """Verifica la connessione con Ollama una sola volta per processo.
+
+    Se la verifica fallisce l'eccezione non viene messa in cache, quindi il
+    client successivo riprova.
+    """
+    ollama.ps()
+    logger.info("Connessione con Ollama stabilita con successo.")
+
+
 class LLMClient:
     """
     Un client per interagire con i modelli locali di Ollama.
@@ -60,8 +70,7 @@ class LLMClient:
         self.default_model = default_model
         try:
             # Verifica la connessione con Ollama all'avvio
-            ollama.ps()
-            logger.info("Connessione con Ollama stabilita con successo.")
+            _ensure_ollama_connection()
         except Exception as e:
             logger.error(f"Impossibile connettersi a Ollama. Assicurati che sia in esecuzione. Errore: {e}")
             raise
@@ -108,11 +117,10 @@ class LLMClient:
         target_model = model if model else self.default_model
         logger.info(f"Avvio streaming dal modello: {target_model}")
 
-        messages = [AgentContext.conversation_history, {'role': 'user', 'content': prompt}]
+        messages = [{'role': 'user', 'content': prompt}]
         if system_prompt:
             messages.insert(0, {'role': 'system', 'content': system_prompt})
 
-        full_response_content = "" 
         try:
             stream = ollama.chat(
                 model=target_model,
@@ -123,15 +131,10 @@ class LLMClient:
                 chunk = chunk_data['message']['content']
                 if print_live:
                     print(chunk, end="", flush=True) # Stampa il chunk direttamente in shell
-                full_response_content += chunk # Accumula il contenuto
                 yield chunk # Restituisce il chunk al chiamante
         except Exception as e:
             logger.error(f"[Errore Streaming] Modello: {target_model} | {e}")
             yield "" # Assicurati di yieldare una stringa vuota per mantenere l'iteratore
-        finally:
-            # Qui potresti aggiungere un log del contenuto completo dello stream se utile,
-            # ma lo faremo nella pipeline per il "reasoning" specifico.
-            pass
     
     def call_json(
         self,
@@ -175,7 +178,7 @@ class LLMClient:
 
             if json_string.startswith("{") and json_string.endswith("}"):
                 # Singolo oggetto → wrappalo in lista
-                return [json.loads(json_string)]
+                return [json_loads(json_string)]
 
             start_index = json_string.find('[')
             end_index = json_string.rfind(']')
@@ -184,7 +187,7 @@ class LLMClient:
                 raise json.JSONDecodeError("Non è stato possibile trovare un array JSON valido nell'output del modello.", json_string, 0)
 
             clean_json_string = json_string[start_index : end_index + 1]
-            return json.loads(clean_json_string)
+            return json_loads(clean_json_string)
         except json.JSONDecodeError as e:
             truncated = raw_content[:1000] if isinstance(raw_content, str) else str(raw_content)
             logger.error(
@@ -3,14 +3,14 @@ import subprocess
 from typing import Iterator, Literal
 
 # Configurazione del logger
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 ModelName = Literal["mistral", "openchat", "deepseek-r1:14b"]
 
 def _run_ollama(model: str, prompt: str) -> str:
     try:
-        logger.info(f"Running model: {model} with prompt length: {len(prompt)} characters")
+        logger.info("Running model: %s with prompt length: %d characters", model, len(prompt))
         result = subprocess.run(
             ["ollama", "run", model],
             input=prompt,
@@ -18,20 +18,21 @@ def _run_ollama(model: str, prompt: str) -> str:
             text=True,
             check=True,
         )
-        logger.info(f"[{model}]: {result.stdout}...")  
+        logger.info("[%s]: %s...", model, result.stdout)
         return result.stdout.strip()
     except subprocess.CalledProcessError as e:
-        logger.error(f"[LLM Error] Model: {model} | Exit Code: {e.returncode}")
+        logger.error("[LLM Error] Model: %s | Exit Code: %s", model, e.returncode)
         logger.error(e.stderr)
         return ""
     except Exception as ex:
-        logger.error(f"[Unexpected Error] Model: {model} | {ex}")
+        logger.error("[Unexpected Error] Model: %s | %s", model, ex)
         return ""
 
 
 def _stream_ollama(model: str, prompt: str) -> Iterator[str]:
+    proc = None
     try:
-        logger.info(f"Starting stream for model {model} with prompt length: {len(prompt)}")
+        logger.info("Starting stream for model %s with prompt length: %d", model, len(prompt))
         proc = subprocess.Popen(
             ["ollama", "run", model],
             stdin=subprocess.PIPE,
@@ -50,14 +51,19 @@ def _stream_ollama(model: str, prompt: str) -> Iterator[str]:
                 chunk = proc.stdout.read(1)
                 if not chunk:
                     break
-                logger.debug(f"Streamed chunk: {chunk}")
+                logger.debug("Streamed chunk: %s", chunk)
                 yield chunk
 
         proc.wait()
 
     except Exception as e:
-        logger.error(f"[Stream Error] Model: {model} | {e}")
+        logger.error("[Stream Error] Model: %s | %s", model, e)
         yield ""
+    finally:
+        # The consumer stopped reading early: stop generating tokens nobody reads
+        if proc is not None and proc.poll() is None:
+            proc.terminate()
+            proc.wait()
 
 
 # === Public interface ===
@@ -86,10 +92,10 @@ def stream_openchat(prompt: str) -> str:
 # === Optional dynamic interface ===
 
 def call_local_llm(model: ModelName, prompt: str) -> str:
-    logger.info(f"Calling local LLM model: {model}")
+    logger.info("Calling local LLM model: %s", model)
     return _run_ollama(model, prompt)
 
 
 def stream_local_llm(model: ModelName, prompt: str) -> Iterator[str]:
-    logger.info(f"Streaming local LLM model: {model}")
+    logger.info("Streaming local LLM model: %s", model)
     return _stream_ollama(model, prompt)
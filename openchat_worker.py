@@ -3,6 +3,15 @@ from typing import Iterator
 from models.call_local_llm import call_openchat, stream_openchat
 
 
+def _response_prompt(user_input: str, intent: str, lang: str) -> str:
+    return (
+        f"The user asked: {user_input}\n"
+        f"Detected intent: {intent}.\n"
+        f"Reply in language: {lang}.\n"
+        "Provide a clear, helpful response."
+    )
+
+
 def generate_response(user_input: str, intent: str, lang: str) -> str:
     """Generate a helpful answer using OpenChat.
 
@@ -10,21 +19,11 @@ def generate_response(user_input: str, intent: str, lang: str) -> str:
     user's message.
     """
 
-    prompt = (
-        f"The user asked: {user_input}\n"
-        f"Detected intent: {intent}.\n"
-        f"Reply in language: {lang}.\n"
-        "Provide a clear, helpful response."
-    )
+    prompt = _response_prompt(user_input, intent, lang)
     return call_openchat(prompt)
 
 
 def generate_response_stream(user_input: str, intent: str, lang: str) -> Iterator[str]:
     """Stream a response from OpenChat."""
-    prompt = (
-        f"The user asked: {user_input}\n"
-        f"Detected intent: {intent}.\n"
-        f"Reply in language: {lang}.\n"
-        "Provide a clear, helpful response."
-    )
+    prompt = _response_prompt(user_input, intent, lang)
     return stream_openchat(prompt)
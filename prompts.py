@@ -1,13 +1,20 @@
 from typing import Dict
 from functools import lru_cache
 
+
+@lru_cache(maxsize=32)
+def _render_category_definitions(categories: tuple) -> str:
+    """Render the category list once per distinct set of categories."""
+    return "\n".join([f'- "{name}": {desc}' for name, desc in categories])
+
+
 class LLMPrompts:
     """Centralized management of LLM prompt templates for clarity and maintainability."""
     
     @staticmethod
     def get_classification_prompt(categories_with_desc: Dict, filename: str, text_preview: str) -> str:
         """Generates the prompt for document classification."""
-        category_definitions = "\n".join([f'- "{name}": {desc}' for name, desc in categories_with_desc.items()])
+        category_definitions = _render_category_definitions(tuple(categories_with_desc.items()))
         return f"""
         You are an expert document classifier. Your task is to classify the document described below into ONE of the following categories.
         First, provide a brief `reasoning` text explaining your choice. Then, on a new line, provide a single, raw JSON object with "category" and "confidence" keys.
@@ -66,6 +66,20 @@ def test_clarification_fallback_to_history(monkeypatch, tmp_path):
     assert ctx.response == "hist?"
 
 
+def test_most_common_question_reread_on_change(monkeypatch, tmp_path):
+    from agents import clarification_agent
+
+    log = tmp_path / "clarification_log.log"
+    log.write_text("a?\na?\n")
+    monkeypatch.setattr("agents.clarification_agent.HISTORY_FILE", log)
+    assert clarification_agent._most_common_question() == "a?"
+    assert clarification_agent._most_common_question() == "a?"
+    assert clarification_agent._most_common_question_in.cache_info().hits >= 1
+
+    log.write_text("a?\nb?\nb?\nb?\n")
+    assert clarification_agent._most_common_question() == "b?"
+
+
 def test_contextual_prompt_includes_history(monkeypatch):
     captured = {}
 
@@ -83,3 +97,19 @@ def test_contextual_prompt_includes_history(monkeypatch):
     run(ctx)
     assert "first" in captured["prompt"]
     assert ctx.response == "sure?"
+
+
+def test_fallback_question_single_llm_call(monkeypatch):
+    from clarification_prompt import generate_fallback_question
+
+    prompts = []
+
+    def fake_call(prompt: str) -> str:
+        prompts.append(prompt)
+        return "cosa intendi?"
+
+    monkeypatch.setattr("clarification_prompt.call_mistral", fake_call)
+    monkeypatch.setattr("language_detector.call_mistral", fake_call)
+    assert generate_fallback_question("boh") == "cosa intendi?"
+    assert len(prompts) == 1
+    assert "boh" in prompts[0]
@@ -20,3 +20,29 @@ def test_admin_access_setup():
     ctx = AgentContext(user_id="a", session_id="s", role="admin", input="setup")
     run(ctx)
     assert ctx.documents == ["setup guide"]
+
+
+def test_repeated_query_uses_cache(monkeypatch):
+    import agents.document_retriever_agent as retriever
+
+    retriever._cached_retrieve.cache_clear()
+    calls = {"n": 0}
+    original = retriever._client.search
+
+    def counting_search(*args, **kwargs):
+        calls["n"] += 1
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(retriever._client, "search", counting_search)
+    for _ in range(2):
+        ctx = AgentContext(user_id="u", session_id="s", role="user", input="manual")
+        run(ctx)
+        assert len(ctx.documents) == 2
+    assert calls["n"] == 1
+
+
+def test_blank_query_returns_no_documents():
+    ctx = AgentContext(user_id="a", session_id="s", role="admin", input="")
+    run(ctx)
+    assert ctx.documents == []
+    assert ctx.source_reliability == 0.5
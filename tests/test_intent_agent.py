@@ -8,3 +8,26 @@ def test_intent_agent(monkeypatch):
     run(ctx)
     assert ctx.intent == "cost_estimation"
     assert ctx.confidence == 1.0
+
+
+def test_detect_intent_memoized(monkeypatch):
+    import intent_router
+
+    intent_router._classify.cache_clear()
+    calls = []
+    monkeypatch.setattr(
+        "intent_router.call_mistral", lambda prompt: calls.append(prompt) or "complaint."
+    )
+    assert intent_router.detect_intent("it arrived  broken") == "complaint"
+    assert intent_router.detect_intent("it arrived broken ") == "complaint"
+    assert len(calls) == 1
+
+
+def test_detect_intent_failure_not_memoized(monkeypatch):
+    import intent_router
+
+    intent_router._classify.cache_clear()
+    monkeypatch.setattr("intent_router.call_mistral", lambda prompt: "")
+    assert intent_router.detect_intent("open a ticket") is None
+    monkeypatch.setattr("intent_router.call_mistral", lambda prompt: "open_ticket")
+    assert intent_router.detect_intent("open a ticket") == "open_ticket"
@@ -0,0 +1,53 @@
+import json
+
+import pytest
+
+from utils.json_utils import dumps, extract_json, loads, parse_json
+
+
+def test_extract_json_with_surrounding_prose():
+    raw = 'Sure! {"reasoning": "quote", "sequence": ["intent"]} Hope this helps {x}'
+    assert json.loads(extract_json(raw)) == {"reasoning": "quote", "sequence": ["intent"]}
+
+
+def test_extract_json_ignores_braces_in_strings():
+    raw = 'Answer: {"text": "a } tricky \\" {string", "n": [1, {"k": 2}]}'
+    assert json.loads(extract_json(raw)) == {"text": 'a } tricky " {string', "n": [1, {"k": 2}]}
+
+
+def test_extract_json_array_and_missing():
+    assert extract_json('x [1, 2] y') == "[1, 2]"
+    assert extract_json("no json here") is None
+    assert extract_json('{"open": 1') is None
+
+
+def test_extract_json_skips_bracketed_prose_before_payload():
+    raw = (
+        "<think>Confidence must be in [0, 1]; template was [Your brief reasoning here.]"
+        '</think>\n{"category": "manual", "confidence": 0.8}'
+    )
+    assert parse_json(raw) == {"category": "manual", "confidence": 0.8}
+    assert extract_json(raw, expected=(dict,)) == '{"category": "manual", "confidence": 0.8}'
+    # Without a type filter the first decodable block still wins
+    assert extract_json(raw) == "[0, 1]"
+
+
+def test_parse_json_returns_none_without_object():
+    assert parse_json("only a list [1, 2] and {broken") is None
+
+
+def test_parse_json_handles_many_unclosed_brackets():
+    # A truncated reply: the unmatched openers must not trigger a rescan each
+    assert parse_json("{" * 50000 + '{"a": 1}') == {"a": 1}
+
+
+def test_loads_decodes_and_raises_json_error():
+    assert loads('{"a": [1, "x"]}') == {"a": [1, "x"]}
+    with pytest.raises(json.JSONDecodeError):
+        loads("{bad")
+
+
+def test_dumps_is_compact_and_keeps_unicode():
+    text = dumps({"prezzo": 1.5, "nome": "caffè", "tag": ["a"]})
+    assert text == '{"prezzo":1.5,"nome":"caffè","tag":["a"]}'
+    assert loads(text) == {"prezzo": 1.5, "nome": "caffè", "tag": ["a"]}
@@ -1,3 +1,5 @@
+import pytest
+
 from agents.context import AgentContext
 from agents.language_agent import run
 
@@ -25,3 +27,94 @@ def test_language_agent_mixed(monkeypatch):
         ctx = AgentContext(user_id="u", session_id="s", input=text)
         run(ctx)
         assert ctx.mixed_language is True
+
+
+def test_detect_language_prefers_local_detector(monkeypatch):
+    import language_detector
+
+    calls = []
+    monkeypatch.setattr(language_detector, "_detect_locally", lambda text: "it")
+    monkeypatch.setattr(language_detector, "call_mistral", lambda prompt: calls.append(prompt) or "fr")
+    assert language_detector.detect_language("Vorrei un preventivo") == "it"
+    assert calls == []
+
+
+def test_detect_language_falls_back_to_llm(monkeypatch):
+    import language_detector
+
+    language_detector._detect_with_llm.cache_clear()
+    monkeypatch.setattr(language_detector, "_detect_locally", lambda text: None)
+    monkeypatch.setattr(language_detector, "call_mistral", lambda prompt: "fr")
+    assert language_detector.detect_language("ciao") == "fr"
+
+
+def test_detect_language_llm_answer_memoized(monkeypatch):
+    import language_detector
+
+    language_detector._detect_with_llm.cache_clear()
+    replies = iter(["", "it", "fr"])
+    monkeypatch.setattr(language_detector, "_detect_locally", lambda text: None)
+    monkeypatch.setattr(language_detector, "call_mistral", lambda prompt: next(replies))
+    assert language_detector.detect_language("ciao") == "en"
+    assert language_detector.detect_language("ciao") == "it"
+    assert language_detector.detect_language("ciao") == "it"
+
+
+def test_detector_built_once_under_concurrent_warm_up(monkeypatch):
+    import threading
+    import time
+
+    import language_detector
+
+    builds = []
+
+    class FakeBuilder:
+        @classmethod
+        def from_all_languages(cls):
+            return cls()
+
+        def with_low_accuracy_mode(self):
+            return self
+
+        def with_preloaded_language_models(self):
+            return self
+
+        def build(self):
+            builds.append(1)
+            time.sleep(0.05)
+            return object()
+
+    language_detector._build_detector.cache_clear()
+    monkeypatch.setattr(language_detector, "LanguageDetectorBuilder", FakeBuilder)
+    try:
+        threads = [threading.Thread(target=language_detector.warm_up) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(builds) == 1
+    finally:
+        language_detector._build_detector.cache_clear()
+
+
+def test_low_confidence_local_guess_falls_back_to_llm(monkeypatch):
+    from types import SimpleNamespace
+
+    import language_detector
+
+    guess = SimpleNamespace(
+        language=SimpleNamespace(iso_code_639_1=SimpleNamespace(name="PT")), value=0.55
+    )
+    detector = SimpleNamespace(compute_language_confidence_values=lambda text: [guess])
+    language_detector._detect_with_llm.cache_clear()
+    monkeypatch.setattr(language_detector, "_get_detector", lambda: detector)
+    monkeypatch.setattr(language_detector, "call_mistral", lambda prompt: "it")
+    assert language_detector.detect_language("Vorrei un preventivo per 10 casse") == "it"
+
+
+def test_local_detector_recognises_languages_outside_the_bot_set():
+    pytest.importorskip("lingua")
+    import language_detector
+
+    assert language_detector._detect_locally("Meu pedido não chegou ainda") == "pt"
+    assert language_detector._detect_locally("Dzień dobry, potrzebuję wyceny głośników") == "pl"
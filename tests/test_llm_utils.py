@@ -0,0 +1,43 @@
+import pytest
+
+llm_utils = pytest.importorskip("knowledge_pipeline.llm_utils")
+
+
+class StubClient:
+    def __init__(self, reply):
+        self.reply = reply
+
+    def call(self, prompt, model=None):
+        return self.reply
+
+
+RECORD = {
+    "serial": "GSP-100",
+    "description": "Cassa attiva",
+    "price": 250.0,
+    "sheet_name": "Listino",
+    "product_status": "active",
+}
+
+
+def test_validate_record_keeps_sheet_values_for_empty_or_invalid_reply():
+    reply = '{"description": "", "price": null}'
+    validated = llm_utils.validate_record_with_llm(dict(RECORD), client=StubClient(reply))
+    assert validated == RECORD
+
+    for price in ('"n/d"', '"nan"', '"inf"', "true", "-5", "250000"):
+        reply = '{"description": "Cassa attiva 12\\"", "price": %s}' % price
+        validated = llm_utils.validate_record_with_llm(dict(RECORD), client=StubClient(reply))
+        assert validated == {**RECORD, "description": 'Cassa attiva 12"'}
+
+
+def test_validate_record_never_rewrites_the_serial():
+    reply = '{"serial": "GSP-100A"}'
+    validated = llm_utils.validate_record_with_llm(dict(RECORD), client=StubClient(reply))
+    assert validated["serial"] == "GSP-100"
+
+
+def test_validate_record_accepts_numeric_price_from_reply():
+    reply = '<think>price in [1, 10000]</think>\n{"price": "199.5"}'
+    validated = llm_utils.validate_record_with_llm(dict(RECORD), client=StubClient(reply))
+    assert validated == {**RECORD, "price": 199.5}
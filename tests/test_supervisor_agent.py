@@ -34,3 +34,13 @@ def test_supervisor_no_issues(tmp_path, monkeypatch):
     run(ctx)
     assert ctx.response == "No issues"
 
+
+def test_collect_snippets_reads_log_tail(tmp_path, monkeypatch):
+    from agents.supervisor_agent import _collect_snippets
+
+    log = tmp_path / "intent_log.log"
+    log.write_text("x" * 5000 + "è" * 100 + "tail-end\n", encoding="utf-8")
+    monkeypatch.setattr("agents.supervisor_agent.LOG_FILES", [log])
+    snippet = _collect_snippets()
+    body = snippet.split("\n", 1)[1]
+    assert body == log.read_text(encoding="utf-8")[-500:]
@@ -8,3 +8,21 @@ def test_translation_agent(monkeypatch):
     run(ctx, "es", style="friendly")
     assert ctx.response == "[friendly] the book-es"
     assert ctx.language == "es"
+
+
+def test_translate_memoized_and_failure_not_cached(monkeypatch):
+    import translator
+
+    translator._cached_translate.cache_clear()
+    replies = iter(["", "ciao", "unused"])
+    calls = []
+
+    def fake_mistral(prompt):
+        calls.append(prompt)
+        return next(replies)
+
+    monkeypatch.setattr("translator.call_mistral", fake_mistral)
+    assert translator.translate("hello", "it") == "hello"
+    assert translator.translate("hello", "it") == "ciao"
+    assert translator.translate("hello", "it") == "ciao"
+    assert len(calls) == 2
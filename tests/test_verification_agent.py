@@ -15,3 +15,53 @@ def test_verification_uncertain(monkeypatch):
     assert run(ctx) is False
     assert ctx.error_flag is False
 
+
+def test_verification_votes_run_concurrently(monkeypatch):
+    import threading
+
+    barrier = threading.Barrier(3, timeout=5)
+
+    def vote(q, a):
+        barrier.wait()
+        return True
+
+    monkeypatch.setattr("agents.verification_agent.verify_response", vote)
+    ctx = AgentContext(user_id="u", session_id="s", input="hi", response="reply")
+    assert run(ctx) is True
+
+
+def test_verify_response_stops_stream_at_verdict(monkeypatch):
+    from verifier import verify_response
+
+    consumed = []
+
+    def fake_stream(model, prompt):
+        for ch in "FALSE, because the answer is off-topic":
+            consumed.append(ch)
+            yield ch
+
+    monkeypatch.setattr("verifier.stream_local_llm", fake_stream)
+    assert verify_response("hi", "reply") is False
+    assert "".join(consumed) == "FALSE"
+
+
+def test_verification_returns_on_two_positive_votes(monkeypatch):
+    import threading
+
+    release = threading.Event()
+    calls = iter([True, True, None])
+
+    def vote(q, a):
+        result = next(calls)
+        if result is None:
+            release.wait(5)
+            return False
+        return result
+
+    monkeypatch.setattr("agents.verification_agent.verify_response", vote)
+    ctx = AgentContext(user_id="u", session_id="s", input="hi", response="reply")
+    try:
+        assert run(ctx) is True
+        assert not release.is_set()
+    finally:
+        release.set()
@@ -1,9 +1,24 @@
 """Utility for translating text using the local LLM."""
 
+from functools import lru_cache
 from typing import Iterator
 
 from models.call_local_llm import call_mistral, _stream_ollama
 
+
+def _has_letters(text: str) -> bool:
+    return any(ch.isalpha() for ch in text)
+
+
+def _translation_prompt(text: str, target_lang: str) -> str:
+    return (
+        f"Translate the following text to {target_lang}.\n"
+        "Return only the translated sentence without explanations.\n"
+        f"Text: {text}\n"
+        "Translated text:"
+    )
+
+
 def translate(text: str, target_lang: str = "en") -> str:
     """Translate ``text`` to ``target_lang`` using Mistral.
 
@@ -13,30 +28,35 @@ def translate(text: str, target_lang: str = "en") -> str:
 
     Returns:
         The translated text. If translation fails, the original text
-        is returned unchanged.
+        is returned unchanged. Text without any letters (empty input,
+        numbers, punctuation) is returned as is without calling the model.
+        Successful translations are memoized per ``(text, target_lang)``.
     """
 
-    prompt = (
-        f"Translate the following text to {target_lang}.\n"
-        "Return only the translated sentence without explanations.\n"
-        f"Text: {text}\n"
-        "Translated text:"
-    )
+    if not _has_letters(text):
+        return text
 
     try:
-        return call_mistral(prompt).strip()
+        return _cached_translate(text, target_lang)
     except Exception:
         return text
 
 
+@lru_cache(maxsize=1024)
+def _cached_translate(text: str, target_lang: str) -> str:
+    translated = call_mistral(_translation_prompt(text, target_lang)).strip()
+    if not translated:
+        # Model unavailable: raise so the failure is not memoized
+        raise RuntimeError("empty translation")
+    return translated
+
+
 def translate_stream(text: str, target_lang: str = "en") -> Iterator[str]:
     """Stream translated text token by token."""
-    prompt = (
-        f"Translate the following text to {target_lang}.\n"
-        "Return only the translated sentence without explanations.\n"
-        f"Text: {text}\n"
-        "Translated text:"
-    )
+    if not _has_letters(text):
+        yield text
+        return
+    prompt = _translation_prompt(text, target_lang)
     try:
         yield from _stream_ollama('mistral',prompt)
     except Exception:
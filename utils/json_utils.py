@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Iterator, List, Optional, Tuple
+
+try:  # optional faster decoder; errors subclass json.JSONDecodeError
+    import orjson
+except ImportError:  # pragma: no cover - fall back to the stdlib
+    orjson = None
+
+
+def loads(text: str) -> Any:
+    """Decode ``text`` with orjson when installed, otherwise with ``json``."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def dumps(obj: Any) -> str:
+    """Encode ``obj`` as compact, non-ASCII-escaped JSON text.
+
+    orjson is used when installed (numpy scalars included, since pandas
+    hands them out); the stdlib fallback produces the same layout.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+_CLOSERS = {"}": "{", "]": "["}
+_OPENER_TYPES = {"{": dict, "[": list}
+
+
+def _balanced_spans(text: str) -> List[Tuple[int, int]]:
+    """Return ``(start, end)`` of every balanced ``{...}``/``[...]`` block, by start.
+
+    A single pass keeps a stack of open bracket positions, so unmatched
+    brackets cost nothing extra. Quotes are tracked only inside an open
+    block, so braces in JSON strings are ignored. A newline also ends a
+    string (JSON strings cannot contain one), so a stray quote in prose
+    hides brackets on its own line only.
+    """
+    spans: List[Tuple[int, int]] = []
+    stack: List[int] = []
+    in_string = False
+    escape = False
+    for i, ch in enumerate(text):
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"' or ch == "\n":
+                in_string = False
+        elif ch in "{[":
+            stack.append(i)
+        elif not stack:
+            continue
+        elif ch == '"':
+            in_string = True
+        elif ch in _CLOSERS:
+            # A closer of the wrong kind is prose: leave the open blocks alone
+            if text[stack[-1]] == _CLOSERS[ch]:
+                spans.append((stack.pop(), i + 1))
+    spans.sort()
+    return spans
+
+
+def _json_blocks(text: str, expected: Tuple[type, ...]) -> Iterator[Tuple[str, Any]]:
+    """Yield ``(slice, value)`` for each decodable block of an ``expected`` type.
+
+    Every balanced block is a candidate, in order of its opening bracket,
+    so prose such as ``"confidence in [0, 1]"`` before the payload is
+    skipped rather than returned.
+    """
+    for start, end in _balanced_spans(text):
+        if not issubclass(_OPENER_TYPES[text[start]], expected):
+            continue
+        block = text[start:end]
+        try:
+            value = loads(block)
+        except (ValueError, RecursionError):  # JSONDecodeError is a ValueError
+            continue
+        yield block, value
+
+
+def extract_json(text: str, expected: Tuple[type, ...] = (dict, list)) -> Optional[str]:
+    """Return the first JSON object or array in ``text`` that decodes.
+
+    Balanced blocks that fail to decode, or are not of a type in
+    ``expected``, are skipped in favour of the next one. Returns ``None``
+    if no block qualifies.
+    """
+    for block, _ in _json_blocks(text, expected):
+        return block
+    return None
+
+
+def parse_json(text: str, expected: Tuple[type, ...] = (dict,)) -> Any:
+    """Like :func:`extract_json` but return the decoded value (default: a dict)."""
+    for _, value in _json_blocks(text, expected):
+        return value
+    return None
@@ -1,13 +1,28 @@
-from models.call_local_llm import call_mistral
+from models.call_local_llm import stream_local_llm
 
 
 def verify_response(user_input: str, response: str) -> bool:
-    """Check whether the answer is relevant and helpful."""
+    """Check whether the answer is relevant and helpful.
+
+    The verdict is streamed and the model is stopped as soon as TRUE or
+    FALSE appears, so any explanation it appends is never generated.
+    """
 
     prompt = (
         f"Answer: \"{response}\"\n"
         f"Question: \"{user_input}\"\n"
         "Evaluate if the answer is relevant and helpful. Respond only with: TRUE or FALSE."
     )
-    result = call_mistral(prompt)
-    return "TRUE" in result.upper()
+    chunks = []
+    stream = stream_local_llm("mistral", prompt)
+    try:
+        for chunk in stream:
+            chunks.append(chunk)
+            # Both verdicts end with "E": only then can one be complete
+            if chunk[-1:] in ("E", "e"):
+                result = "".join(chunks).upper()
+                if "TRUE" in result or "FALSE" in result:
+                    break
+    finally:
+        stream.close()
+    return "TRUE" in "".join(chunks).upper()